@@ -2,11 +2,21 @@ from __future__ import annotations
 
 from typing import Any
 
+import bottleneck as bn
 import numpy as np
 import pandas as pd
 from freqtrade.strategy import IStrategy
 
 
+def _rolling_flag_count(flags: np.ndarray, window: int) -> np.ndarray:
+    """Bool bayraklar için kayan pencere toplamı: cumsum farkıyla tek O(n) geçiş."""
+    csum = np.concatenate(([0], np.cumsum(flags, dtype=np.int64)))
+    out = np.full(flags.shape[0], np.nan)
+    if flags.shape[0] >= window:
+        out[window - 1 :] = csum[window:] - csum[:-window]
+    return out
+
+
 class VisualPriceAction(IStrategy):
     """
     Range odaklı price-action stratejisi.
@@ -34,55 +44,67 @@ class VisualPriceAction(IStrategy):
     def populate_indicators(self, dataframe: pd.DataFrame, metadata: dict[str, Any]) -> pd.DataFrame:
         df = dataframe
 
-        df["body"] = (df["close"] - df["open"]).abs()
-        df["upper_wick"] = df["high"] - df[["close", "open"]].max(axis=1)
-        df["lower_wick"] = df[["close", "open"]].min(axis=1) - df["low"]
-        df["volume_sma_20"] = df["volume"].rolling(20).mean()
-
-        raw_swing_high = (
-            (df["high"] > df["high"].shift(1))
-            & (df["high"] > df["high"].shift(2))
-            & (df["high"] > df["high"].shift(-1))
-            & (df["high"] > df["high"].shift(-2))
-        )
-        raw_swing_low = (
-            (df["low"] < df["low"].shift(1))
-            & (df["low"] < df["low"].shift(2))
-            & (df["low"] < df["low"].shift(-1))
-            & (df["low"] < df["low"].shift(-2))
-        )
+        # Gövde/fitil hesapları ham dizilerde: 2 kolonluk frame üzerinde satır
+        # bazlı max/min yerine tek geçişlik np.maximum/np.minimum.
+        close_arr = df["close"].to_numpy()
+        open_arr = df["open"].to_numpy()
+        df["body"] = np.abs(close_arr - open_arr)
+        df["upper_wick"] = df["high"].to_numpy() - np.maximum(close_arr, open_arr)
+        df["lower_wick"] = np.minimum(close_arr, open_arr) - df["low"].to_numpy()
+        # bottleneck pencereden kısa girdide hata verir; kısa veri için
+        # rolling(20).mean() ile aynı şekilde tümü NaN kolon üretilir.
+        volume_arr = df["volume"].to_numpy()
+        if volume_arr.shape[0] >= 20:
+            df["volume_sma_20"] = bn.move_mean(volume_arr, window=20)
+        else:
+            df["volume_sma_20"] = np.full(volume_arr.shape[0], np.nan)
+
+        # Swing tespiti shift() yerine dilimlenmiş numpy görünümleriyle yapılır;
+        # 8 ayrı geçici Series yerine tek boolean reduce geçişi.
+        n = len(df)
+        high = df["high"].to_numpy()
+        low = df["low"].to_numpy()
+
+        raw_swing_high = np.zeros(n, dtype=bool)
+        raw_swing_low = np.zeros(n, dtype=bool)
+        if n >= 5:
+            center_high = high[2:-2]
+            raw_swing_high[2:-2] = np.logical_and.reduce(
+                [
+                    center_high > high[1:-3],
+                    center_high > high[:-4],
+                    center_high > high[3:-1],
+                    center_high > high[4:],
+                ]
+            )
+            center_low = low[2:-2]
+            raw_swing_low[2:-2] = np.logical_and.reduce(
+                [
+                    center_low < low[1:-3],
+                    center_low < low[:-4],
+                    center_low < low[3:-1],
+                    center_low < low[4:],
+                ]
+            )
 
         # Lookahead bias engeli için swing onayı 2 mum sonra aktif olur.
-        df["swing_high"] = raw_swing_high.shift(2).fillna(False)
-        df["swing_low"] = raw_swing_low.shift(2).fillna(False)
-
-        last_high = np.nan
-        prev_high = np.nan
-        last_low = np.nan
-        prev_low = np.nan
-
-        last_highs: list[float] = []
-        prev_highs: list[float] = []
-        last_lows: list[float] = []
-        prev_lows: list[float] = []
-
-        for high, low, is_high, is_low in zip(df["high"], df["low"], df["swing_high"], df["swing_low"]):
-            if is_high:
-                prev_high = last_high
-                last_high = high
-            if is_low:
-                prev_low = last_low
-                last_low = low
-
-            last_highs.append(last_high)
-            prev_highs.append(prev_high)
-            last_lows.append(last_low)
-            prev_lows.append(prev_low)
-
-        df["last_swing_high"] = pd.Series(last_highs, index=df.index)
-        df["prev_swing_high"] = pd.Series(prev_highs, index=df.index)
-        df["last_swing_low"] = pd.Series(last_lows, index=df.index)
-        df["prev_swing_low"] = pd.Series(prev_lows, index=df.index)
+        swing_high = np.zeros(n, dtype=bool)
+        swing_low = np.zeros(n, dtype=bool)
+        swing_high[2:] = raw_swing_high[:-2]
+        swing_low[2:] = raw_swing_low[:-2]
+        df["swing_high"] = swing_high
+        df["swing_low"] = swing_low
+
+        # Satır satır Python döngüsü yerine vektörel swing takibi:
+        # swing mumlarındaki değerler ileri taşınır (ffill), önceki swing ise
+        # swing anında bir adım kaydırılmış "last" değerinden okunur.
+        swing_high_vals = df["high"].where(df["swing_high"])
+        swing_low_vals = df["low"].where(df["swing_low"])
+
+        df["last_swing_high"] = swing_high_vals.ffill()
+        df["prev_swing_high"] = df["last_swing_high"].shift(1).where(df["swing_high"]).ffill()
+        df["last_swing_low"] = swing_low_vals.ffill()
+        df["prev_swing_low"] = df["last_swing_low"].shift(1).where(df["swing_low"]).ffill()
 
         trend_up = (df["last_swing_high"] > df["prev_swing_high"]) & (df["last_swing_low"] > df["prev_swing_low"])
         trend_down = (df["last_swing_high"] < df["prev_swing_high"]) & (df["last_swing_low"] < df["prev_swing_low"])
@@ -99,23 +121,34 @@ class VisualPriceAction(IStrategy):
         df["touch_low_bounce"] = df["touch_low"] & (df["close"] > df["open"])
         df["touch_high_reject"] = df["touch_high"] & (df["close"] < df["open"])
 
-        df["touch_low_count"] = df["touch_low_bounce"].rolling(self.touch_lookback).sum()
-        df["touch_high_count"] = df["touch_high_reject"].rolling(self.touch_lookback).sum()
+        df["touch_low_count"] = _rolling_flag_count(
+            df["touch_low_bounce"].to_numpy().astype(np.int8), self.touch_lookback
+        )
+        df["touch_high_count"] = _rolling_flag_count(
+            df["touch_high_reject"].to_numpy().astype(np.int8), self.touch_lookback
+        )
 
-        df["lower_wick_ratio"] = df["lower_wick"] / df["body"].replace(0, np.nan)
-        df["upper_wick_ratio"] = df["upper_wick"] / df["body"].replace(0, np.nan)
+        # Fitil oranları sadece eşik karşılaştırmasında kullanılıyor; float32
+        # hassasiyeti yeterli ve kolon başına bellek yarıya iner.
+        body_safe = df["body"].replace(0, np.nan)
+        df["lower_wick_ratio"] = (df["lower_wick"] / body_safe).astype(np.float32)
+        df["upper_wick_ratio"] = (df["upper_wick"] / body_safe).astype(np.float32)
 
         return df
 
     def populate_entry_trend(self, dataframe: pd.DataFrame, metadata: dict[str, Any]) -> pd.DataFrame:
         df = dataframe
 
-        long_condition = (
-            (df["trend"] == "RANGE")
-            & df["near_range_low"]
-            & (df["touch_low_count"] >= self.min_touches)
-            & (df["lower_wick_ratio"] > self.wick_ratio)
-            & (df["volume"] < df["volume_sma_20"])
+        # Koşullar ham numpy dizileri üzerinde tek reduce geçişiyle birleştirilir;
+        # Series `&` zincirindeki ara tahsisler ve index hizalaması atlanır.
+        long_condition = np.logical_and.reduce(
+            [
+                df["trend"].to_numpy() == "RANGE",
+                df["near_range_low"].to_numpy(),
+                df["touch_low_count"].to_numpy() >= self.min_touches,
+                df["lower_wick_ratio"].to_numpy() > self.wick_ratio,
+                df["volume"].to_numpy() < df["volume_sma_20"].to_numpy(),
+            ]
         )
 
         df.loc[long_condition, ["enter_long", "enter_tag"]] = (1, "range_support_bounce")
@@ -124,12 +157,14 @@ class VisualPriceAction(IStrategy):
     def populate_exit_trend(self, dataframe: pd.DataFrame, metadata: dict[str, Any]) -> pd.DataFrame:
         df = dataframe
 
-        exit_condition = (
-            (df["trend"] == "RANGE")
-            & df["near_range_high"]
-            & (df["touch_high_count"] >= self.min_touches)
-            & (df["upper_wick_ratio"] > self.wick_ratio)
-            & (df["volume"] < df["volume_sma_20"])
+        exit_condition = np.logical_and.reduce(
+            [
+                df["trend"].to_numpy() == "RANGE",
+                df["near_range_high"].to_numpy(),
+                df["touch_high_count"].to_numpy() >= self.min_touches,
+                df["upper_wick_ratio"].to_numpy() > self.wick_ratio,
+                df["volume"].to_numpy() < df["volume_sma_20"].to_numpy(),
+            ]
         )
 
         df.loc[exit_condition, ["exit_long", "exit_tag"]] = (1, "range_resistance_reject")